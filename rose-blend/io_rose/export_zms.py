@@ -1,22 +1,99 @@
 from pathlib import Path
 import struct
 import ast
+import json
 
-if "bpy" in locals():
-    import importlib
-else:
-    from .rose.zms import *
+import numpy as np
+
+from .rose.utils import Vector3
+from .rose.zms import ZMS, VertexFlags
 
 import bpy
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 from bpy_extras.io_utils import ExportHelper
 
+# Precompiled packers for header and scalar fields
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_VEC3 = struct.Struct("<3f")
+
+def _safe_parse(raw):
+    """Return a zms_* metadata list as ints, or None if missing or unreadable
+    
+    Current imports store ID property int arrays; older .blend files hold
+    str(list) text, which is read as JSON with literal_eval as last resort.
+    """
+    if raw is None:
+        return None
+    try:
+        if isinstance(raw, str):
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return ast.literal_eval(raw)
+        return [int(x) for x in raw]
+    except Exception:
+        return None
+
+class _OutputBuffer:
+    """Growable output buffer that keeps its allocation between exports"""
+    def __init__(self):
+        self.data = bytearray()
+        self.size = 0
+
+    def reset(self):
+        self.size = 0
+
+    def reserve(self, n):
+        end = self.size + n
+        if end > len(self.data):
+            self.data.extend(bytes(max(end - len(self.data), len(self.data))))
+        return end
+
+    def pack(self, packer, *values):
+        """Pack values with a struct.Struct directly into the buffer"""
+        end = self.reserve(packer.size)
+        packer.pack_into(self.data, self.size, *values)
+        self.size = end
+
+    def __iadd__(self, chunk):
+        end = self.reserve(len(chunk))
+        self.data[self.size:end] = chunk
+        self.size = end
+        return self
+
+    def write_to(self, f):
+        """Write the buffered payload; handles short writes on unbuffered files"""
+        with memoryview(self.data) as view:
+            off = 0
+            while off < self.size:
+                with view[off:self.size] as payload:
+                    off += f.write(payload)
+
+# Vertex data blocks in file order: (required flags, ZMS vertex array)
+_VERTEX_SECTIONS = (
+    (VertexFlags.POSITION, "positions"),
+    (VertexFlags.NORMAL, "normals"),
+    (VertexFlags.COLOR, "colors"),
+    (VertexFlags.BONE_WEIGHT | VertexFlags.BONE_INDEX, "bones"),
+    (VertexFlags.TANGENT, "tangents"),
+    (VertexFlags.UV1, "uv1"),
+    (VertexFlags.UV2, "uv2"),
+    (VertexFlags.UV3, "uv3"),
+    (VertexFlags.UV4, "uv4"),
+)
+
 
 class ExportZMS(bpy.types.Operator, ExportHelper):
     bl_idname = "rose.export_zms"
     bl_label = "Export ROSE Mesh (.zms)"
     bl_options = {"PRESET"}
 
+    # flags -> vertex sections written for that flag combination
+    _vertex_layouts = {}
+    # Output buffer reused by every export
+    _write_buf = _OutputBuffer()
+
     filename_ext = ".ZMS"
     filter_glob = StringProperty(default="*.ZMS", options={"HIDDEN"})
     
@@ -49,6 +126,12 @@ class ExportZMS(bpy.types.Operator, ExportHelper):
         description="Export UV coordinates",
         default=True,
     )
+    
+    debug_logging = BoolProperty(
+        name="Debug Logging",
+        description="Report detailed export information",
+        default=False,
+    )
 
     def execute(self, context):
         filepath = Path(self.filepath)
@@ -81,53 +164,20 @@ class ExportZMS(bpy.types.Operator, ExportHelper):
             self.report({'ERROR'}, f"Mesh has {len(mesh.loop_triangles)} triangles. C++ uses uint16 (max 65,535).")
             return {'CANCELLED'}
         
-        # Apply all transformations before export
-        import bmesh
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-        bmesh.ops.transform(bm, matrix=obj.matrix_world, verts=bm.verts)
-        
-        # Create a temporary mesh with transformations applied
-        temp_mesh = bpy.data.meshes.new("temp_export")
-        bm.to_mesh(temp_mesh)
-        bm.free()
-        temp_mesh.calc_loop_triangles()
+        # Apply all transformations before export (baked into the exported
+        # positions/normals, the mesh itself is left untouched)
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        if np.allclose(matrix, np.identity(4), rtol=0.0, atol=1e-7):
+            matrix = None  # Common for freshly imported objects, nothing to bake
         
         # Restore ZMS metadata from the original object (if available)
-        orig_materials = None
-        orig_strips = None
-        orig_pool = None
-        orig_bones = None
-
-        if "zms_materials" in obj:
-            try:
-                orig_materials = ast.literal_eval(obj["zms_materials"])
-            except Exception:
-                orig_materials = None
-
-        if "zms_strips" in obj:
-            try:
-                orig_strips = ast.literal_eval(obj["zms_strips"])
-            except Exception:
-                orig_strips = None
-
-        if "zms_pool" in obj:
-            try:
-                orig_pool = obj["zms_pool"]
-            except Exception:
-                orig_pool = None
-
-        if "zms_bones" in obj:
-            try:
-                orig_bones = ast.literal_eval(obj["zms_bones"])
-            except Exception:
-                orig_bones = None
+        orig_materials = _safe_parse(obj.get("zms_materials"))
+        orig_strips = _safe_parse(obj.get("zms_strips"))
+        orig_pool = obj.get("zms_pool")
+        orig_bones = _safe_parse(obj.get("zms_bones"))
 
         # Create ZMS from mesh
-        zms = self.zms_from_mesh_data(temp_mesh, obj, orig_bones, version)
-        
-        # Clean up temp mesh
-        bpy.data.meshes.remove(temp_mesh)
+        zms = self.zms_from_mesh_data(mesh, obj, orig_bones, version, matrix)
         
         # Check if zms creation failed
         if zms is None:
@@ -144,49 +194,53 @@ class ExportZMS(bpy.types.Operator, ExportHelper):
             zms.bones = orig_bones
         
         # Final validation - C++ uses uint16 for everything in memory
-        if len(zms.vertices) > 65535:
-            self.report({'ERROR'}, f"After processing: {len(zms.vertices)} vertices (max 65,535). Mesh has UV seams that split vertices.")
+        if len(zms.positions) > 65535:
+            self.report({'ERROR'}, f"After processing: {len(zms.positions)} vertices (max 65,535). Mesh has UV seams that split vertices.")
             return {'CANCELLED'}
         
-        # Debug logging
-        self.report({'INFO'}, f"=== ZMS Export Debug ===")
-        self.report({'INFO'}, f"Identifier: {zms.identifier}")
-        self.report({'INFO'}, f"Version: {zms.version}")
-        self.report({'INFO'}, f"Flags: {zms.flags}")
-        self.report({'INFO'}, f"Vertices: {len(zms.vertices)}")
-        self.report({'INFO'}, f"Indices: {len(zms.indices)}")
-        self.report({'INFO'}, f"Bones: {zms.bones}")
-        self.report({'INFO'}, f"Materials: {zms.materials}")
-        self.report({'INFO'}, f"Strips: {zms.strips}")
-        self.report({'INFO'}, f"Pool: {zms.pool}")
-        self.report({'INFO'}, f"Bounding Box Min: ({zms.bounding_box_min.x}, {zms.bounding_box_min.y}, {zms.bounding_box_min.z})")
-        self.report({'INFO'}, f"Bounding Box Max: ({zms.bounding_box_max.x}, {zms.bounding_box_max.y}, {zms.bounding_box_max.z})")
-        
         # Validate indices don't exceed vertex count
-        max_idx = 0
-        for idx in zms.indices:
-            max_idx = max(max_idx, int(idx.x), int(idx.y), int(idx.z))
-        self.report({'INFO'}, f"Max face index: {max_idx} (should be < {len(zms.vertices)})")
-        
-        if max_idx >= len(zms.vertices):
-            self.report({'ERROR'}, f"Face indices reference vertices that don't exist! Max index: {max_idx}, Vertex count: {len(zms.vertices)}")
+        max_idx = int(zms.indices.max(initial=0))
+        
+        # Debug logging (one report, only formatted when enabled)
+        if self.debug_logging:
+            self.report({'INFO'}, "\n".join([
+                "=== ZMS Export Debug ===",
+                f"Identifier: {zms.identifier}",
+                f"Version: {zms.version}",
+                f"Flags: {zms.flags}",
+                f"Vertices: {len(zms.positions)}",
+                f"Indices: {len(zms.indices)}",
+                f"Bones: {zms.bones}",
+                f"Materials: {zms.materials}",
+                f"Strips: {zms.strips}",
+                f"Pool: {zms.pool}",
+                f"Bounding Box Min: ({zms.bounding_box_min.x}, {zms.bounding_box_min.y}, {zms.bounding_box_min.z})",
+                f"Bounding Box Max: ({zms.bounding_box_max.x}, {zms.bounding_box_max.y}, {zms.bounding_box_max.z})",
+                f"Max face index: {max_idx} (should be < {len(zms.positions)})",
+                "=======================",
+            ]))
+        
+        if max_idx >= len(zms.positions):
+            self.report({'ERROR'}, f"Face indices reference vertices that don't exist! Max index: {max_idx}, Vertex count: {len(zms.positions)}")
             return {'CANCELLED'}
         
-        self.report({'INFO'}, f"=======================")
-        
         # Write to file
         try:
-            with open(str(filepath), "wb") as f:
+            with open(str(filepath), "wb", buffering=0) as f:
                 self.write_zms(f, zms)
         except Exception as e:
             self.report({'ERROR'}, f"Failed to write ZMS file: {str(e)}")
             return {'CANCELLED'}
         
-        self.report({'INFO'}, f"Exported {filepath.name} (v{zms.version}, {len(zms.vertices)} verts, {len(zms.indices)} tris)")
+        self.report({'INFO'}, f"Exported {filepath.name} (v{zms.version}, {len(zms.positions)} verts, {len(zms.indices)} tris)")
         return {"FINISHED"}
     
-    def zms_from_mesh_data(self, mesh, obj=None, orig_bones=None, version=8):
-        """Extract ZMS data from mesh data"""
+    def zms_from_mesh_data(self, mesh, obj=None, orig_bones=None, version=8, matrix=None):
+        """Extract ZMS data from mesh data
+        
+        If given, matrix (4x4, e.g. the object's matrix_world) is applied to
+        vertex positions and normals.
+        """
         # Create a report function wrapper
         def report_wrapper(level, message):
             self.report({level}, message)
@@ -240,157 +294,197 @@ class ExportZMS(bpy.types.Operator, ExportHelper):
             zms.flags |= VertexFlags.BONE_WEIGHT
             zms.flags |= VertexFlags.BONE_INDEX
 
-        # Split vertices by unique UV coordinates
-        vertex_map = {}
-
-        # Process each triangle
-        for tri in mesh.loop_triangles:
-            tri_indices = []
-            
-            for loop_idx in tri.loops:
-                loop = mesh.loops[loop_idx]
-                vert_idx = loop.vertex_index
-                vert = mesh.vertices[vert_idx]
-                
-                # Build a key with vertex index and UV coordinates
-                uv_key = [vert_idx]
-                
-                for uv_idx in range(4):
-                    if uv_idx < len(mesh.uv_layers) and len(mesh.uv_layers[uv_idx].data) > loop_idx:
-                        uv = mesh.uv_layers[uv_idx].data[loop_idx].uv
-                        uv_key.extend([round(uv[0], 6), round(uv[1], 6)])
-                
-                if self.export_colors and len(mesh.vertex_colors) > 0:
-                    color_layer = mesh.vertex_colors[0]
-                    if loop_idx < len(color_layer.data):
-                        color = color_layer.data[loop_idx].color
-                        uv_key.extend([round(c, 6) for c in color])
-                
-                key = tuple(uv_key)
-                
-                # CRITICAL CHECK: Ensure we don't exceed uint16 max for indices
-                if len(zms.vertices) >= 65535:
-                    self.report({'ERROR'}, f"Vertex count would exceed 65,535 after UV splitting. Current: {len(zms.vertices)}. Reduce subdivision or use fewer UV seams.")
-                    return None
-                
-                if key not in vertex_map:
-                    v = Vertex()
-                    # vec3 position
-                    v.position = Vector3(vert.co.x, vert.co.y, vert.co.z)
-                    
-                    # Scale positions for version 5/6 (stored *100 in file)
-                    if version <= 6:
-                        v.position.x *= 100.0
-                        v.position.y *= 100.0
-                        v.position.z *= 100.0
-                    
-                    # vec3 normal
-                    if zms.normals_enabled():
-                        v.normal = Vector3(vert.normal.x, vert.normal.y, vert.normal.z)
-                    
-                    # zz_color (4x float)
-                    if zms.colors_enabled():
-                        if len(mesh.vertex_colors) > 0 and loop_idx < len(mesh.vertex_colors[0].data):
-                            color = mesh.vertex_colors[0].data[loop_idx].color
-                            v.color = Color4(color[0], color[1], color[2], 
-                                           color[3] if len(color) > 3 else 1.0)
-                        else:
-                            v.color = Color4(1.0, 1.0, 1.0, 1.0)
-                    
-                    # Set UV coordinates (flip V) - vec2
-                    for uv_idx in range(4):
-                        if uv_idx < len(mesh.uv_layers) and len(mesh.uv_layers[uv_idx].data) > loop_idx:
-                            uv = mesh.uv_layers[uv_idx].data[loop_idx].uv
-                            v_coord = 1.0 - uv[1]  # Flip V coordinate
-                            
-                            if uv_idx == 0:
-                                v.uv1 = Vector2(uv[0], v_coord)
-                            elif uv_idx == 1:
-                                v.uv2 = Vector2(uv[0], v_coord)
-                            elif uv_idx == 2:
-                                v.uv3 = Vector2(uv[0], v_coord)
-                            elif uv_idx == 3:
-                                v.uv4 = Vector2(uv[0], v_coord)
-
-                    # Bone weights (vec4 - 4x float) and indices (vec4 stored as uint16/uint32 depending on version)
-                    if zms.bones_enabled() and obj is not None:
-                        groups = []
-                        try:
-                            orig_v = obj.data.vertices[vert_idx]
-                            groups = [(g.group, g.weight) for g in orig_v.groups]
-                        except Exception:
-                            groups = []
-
-                        groups.sort(key=lambda x: x[1], reverse=True)
-                        top = groups[:4]
-                        total = sum(w for _, w in top) or 1.0
-
-                        weights = [w / total for _, w in top] + [0.0] * (4 - len(top))
-                        group_indices = [int(gi) for gi, _ in top] + [0] * (4 - len(top))
-
-                        # Convert group indices to bone IDs using zms.bones (uint16 values)
-                        bone_ids = []
-                        for gi in group_indices:
-                            if 0 <= gi < len(zms.bones):
-                                bone_ids.append(zms.bones[gi])
-                            else:
-                                bone_ids.append(0)
-
-                        v.bone_weights = weights[:4]
-                        v.bone_indices = bone_ids[:4]
-
-                    new_idx = len(zms.vertices)
-                    zms.vertices.append(v)
-                    vertex_map[key] = new_idx
-                
-                tri_indices.append(vertex_map[key])
-            
-            # usvec3 - 3x uint16 indices per face
-            if len(tri_indices) == 3:
-                zms.indices.append(Vector3(tri_indices[0], tri_indices[1], tri_indices[2]))
-        
-        # Calculate bounding box (vec3 pmin, pmax)
-        if len(zms.vertices) > 0:
-            # Get positions (accounting for scaling)
-            positions = []
-            for v in zms.vertices:
-                if version <= 6:
-                    # Already scaled, so divide back for bounding box calculation
-                    positions.append((v.position.x / 100.0, v.position.y / 100.0, v.position.z / 100.0))
-                else:
-                    positions.append((v.position.x, v.position.y, v.position.z))
-            
-            min_x = min(p[0] for p in positions)
-            min_y = min(p[1] for p in positions)
-            min_z = min(p[2] for p in positions)
-            max_x = max(p[0] for p in positions)
-            max_y = max(p[1] for p in positions)
-            max_z = max(p[2] for p in positions)
-            
-            zms.bounding_box_min = Vector3(min_x, min_y, min_z)
-            zms.bounding_box_max = Vector3(max_x, max_y, max_z)
+        # Pull mesh attributes into flat arrays once instead of going through
+        # mesh.loops[i] / mesh.vertices[i] / uv_layers[i].data[j] per corner
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+        positions = positions.reshape(-1, 3)
+
+        normals = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("normal", normals)
+        normals = normals.reshape(-1, 3)
+
+        if matrix is not None:
+            positions, normals = self.transform_vertices(positions, normals, matrix)
+
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_verts)
+
+        tri_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("loops", tri_loops)
+
+        # (uv_idx, per-loop uv) for each non-empty layer, up to 4 channels
+        uv_layers = []
+        for uv_idx, layer in enumerate(mesh.uv_layers[:4]):
+            if len(layer.data) == 0:
+                continue
+            uvs = np.empty(len(layer.data) * 2, dtype=np.float32)
+            layer.data.foreach_get("uv", uvs)
+            uvs = uvs.reshape(-1, 2)
+            uvs[:, 1] = 1.0 - uvs[:, 1]  # Flip V coordinate
+            uv_layers.append((uv_idx, uvs))
+
+        colors = None
+        if self.export_colors and len(mesh.vertex_colors) > 0:
+            color_data = mesh.vertex_colors[0].data
+            colors = np.empty(len(color_data) * 4, dtype=np.float32)
+            color_data.foreach_get("color", colors)
+            colors = colors.reshape(-1, 4)
+
+        # Split vertices by unique (vertex, UVs, color) per triangle corner.
+        # Pack each corner into one structured row and let numpy.unique do
+        # the dedup instead of hashing a Python tuple per corner. UVs and
+        # colors are keyed quantized to 1e-6 (same tolerance as round(x, 6)).
+        fields = [("vert", "<i4")]
+        fields += [(f"uv{uv_idx}", "<i8", 2) for uv_idx, _ in uv_layers]
+        if colors is not None:
+            fields.append(("color", "<i8", 4))
+
+        corner_rows = np.empty(len(tri_loops), dtype=fields)
+        corner_rows["vert"] = loop_verts[tri_loops]
+        for uv_idx, uvs in uv_layers:
+            corner_rows[f"uv{uv_idx}"] = self.quantize(uvs[tri_loops])
+        if colors is not None:
+            corner_rows["color"] = self.quantize(colors[tri_loops])
+
+        # Compare rows as raw bytes: one memcmp per comparison instead of a
+        # field-by-field structured compare
+        corner_keys = corner_rows.view(np.dtype((np.void, corner_rows.dtype.itemsize)))
+        _, first, inverse = np.unique(corner_keys, return_index=True, return_inverse=True)
+
+        # Keep vertices in first-seen order so output order follows the triangles
+        order = np.argsort(first, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        corners = remap[inverse.ravel()]
+        vertex_loops = tri_loops[first[order]]
+
+        # CRITICAL CHECK: Ensure we don't exceed uint16 max for indices
+        if len(vertex_loops) > 65535:
+            self.report({'ERROR'}, f"Vertex count would exceed 65,535 after UV splitting. Current: {len(vertex_loops)}. Reduce subdivision or use fewer UV seams.")
+            return None
+
+        # Fill the vertex arrays straight from the gathered mesh data
+        vertex_verts = loop_verts[vertex_loops]
+        zms.alloc_vertices(len(vertex_loops))
+
+        # vec3 position
+        zms.positions[:] = positions[vertex_verts]
+        
+        # Scale positions for version 5/6 (stored *100 in file)
+        if version <= 6:
+            zms.positions *= 100.0
+        
+        # vec3 normal
+        if zms.normals_enabled():
+            zms.normals[:] = normals[vertex_verts]
+        
+        # zz_color (4x float)
+        if zms.colors_enabled():
+            if colors is not None:
+                zms.colors[:] = colors[vertex_loops]
+            else:
+                zms.colors[:] = 1.0
+        
+        # Set UV coordinates (V already flipped) - vec2
+        for uv_idx, uvs in uv_layers:
+            getattr(zms, ("uv1", "uv2", "uv3", "uv4")[uv_idx])[:] = uvs[vertex_loops]
+
+        # Bone weights (vec4 - 4x float) and indices (vec4 stored as uint16/uint32 depending on version)
+        if zms.bones_enabled() and obj is not None:
+            bone_weights, bone_ids = self.vertex_bone_weights(obj.data.vertices, zms.bones)
+            zms.bone_weights[:] = bone_weights[vertex_verts]
+            zms.bone_indices[:] = bone_ids[vertex_verts]
+        
+        # usvec3 - 3x uint16 indices per face
+        zms.indices = corners.reshape(-1, 3).astype(np.uint16)
+        
+        # Calculate bounding box (vec3 pmin, pmax) from the unscaled positions
+        if len(vertex_loops) > 0:
+            used_positions = positions[vertex_verts]
+            zms.bounding_box_min = Vector3(*used_positions.min(axis=0).tolist())
+            zms.bounding_box_max = Vector3(*used_positions.max(axis=0).tolist())
         
         return zms
 
+    def quantize(self, values):
+        """Return float values as integer dedup keys at 1e-6 resolution"""
+        return np.rint(values.astype(np.float64) * 1e6).astype(np.int64)
+    
+    def transform_vertices(self, positions, normals, matrix):
+        """Apply a 4x4 transform to (n, 3) positions and normals
+        
+        Normals use the inverse transpose (flipped for mirroring transforms),
+        which matches what Blender recalculates after transforming the mesh.
+        """
+        linear = matrix[:3, :3]
+        positions = (positions @ linear.T + matrix[:3, 3]).astype(np.float32)
+
+        det = np.linalg.det(linear)
+        if det != 0.0:
+            normals = normals @ (np.linalg.inv(linear) * np.sign(det))
+            lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+            lengths[lengths == 0.0] = 1.0
+            normals = (normals / lengths).astype(np.float32)
+
+        return positions, normals
+
+    def vertex_bone_weights(self, vertices, bones):
+        """Return the 4 heaviest normalized group weights per vertex and their bone IDs
+        
+        Group indices are mapped to bone IDs through bones (zms.bones). Unused
+        slots get weight 0.0 and group 0; groups outside bones map to bone ID 0.
+        """
+        vert_groups = [v.groups for v in vertices]
+        width = max(4, max((len(groups) for groups in vert_groups), default=0))
+
+        group_idx = np.zeros((len(vert_groups), width), dtype=np.int64)
+        group_w = np.zeros((len(vert_groups), width), dtype=np.float64)
+        for i, groups in enumerate(vert_groups):
+            for j, g in enumerate(groups):
+                group_idx[i, j] = g.group
+                group_w[i, j] = g.weight
+
+        # Heaviest first; stable so equal weights keep vertex group order
+        top = np.argsort(-group_w, axis=1, kind="stable")[:, :4]
+        weights = np.take_along_axis(group_w, top, axis=1)
+        group_idx = np.take_along_axis(group_idx, top, axis=1)
+
+        totals = weights.sum(axis=1, keepdims=True)
+        totals[totals == 0.0] = 1.0
+        weights /= totals
+
+        # Convert group indices to bone IDs using zms.bones (uint16 values)
+        bone_lut = np.append(np.asarray(bones, dtype=np.int64), 0)
+        in_range = (group_idx >= 0) & (group_idx < len(bones))
+        bone_ids = bone_lut[np.where(in_range, group_idx, len(bones))]
+
+        return weights, bone_ids
+
     def write_zms(self, f, zms):
+        """Serialize zms into the shared output buffer and write it to f in a single call"""
         version = zms.version
+        buf = self._write_buf
+        buf.reset()
         
         # Write identifier (null-terminated string)
-        f.write(zms.identifier.encode('ascii') + b'\x00')
+        buf += zms.identifier.encode('ascii') + b'\x00'
         
         # Write flags (uint32 in file, but int vertex_format in C++)
-        f.write(struct.pack("<I", zms.flags))
+        buf.pack(_U32, zms.flags)
         
         # Write bounding box (vec3 - 3x float)
-        self.write_vector3_f32(f, zms.bounding_box_min)
-        self.write_vector3_f32(f, zms.bounding_box_max)
+        self.write_vector3_f32(buf, zms.bounding_box_min)
+        self.write_vector3_f32(buf, zms.bounding_box_max)
         
         if version <= 6:
-            self._write_version6(f, zms, version)
+            self._write_version6(buf, zms, version)
         else:
-            self._write_version8(f, zms, version)
+            self._write_version8(buf, zms, version)
+        
+        buf.write_to(f)
     
-    def _write_version6(self, f, zms, version):
+    def _write_version6(self, buf, zms, version):
         """Write ZMS version 5 or 6 format
         
         File format uses uint32 for counts/indices
@@ -400,177 +494,93 @@ class ExportZMS(bpy.types.Operator, ExportHelper):
         bone_table = zms.bones if zms.bones else []
         
         # Write bone count (uint32 in file)
-        f.write(struct.pack("<I", len(bone_table)))
-        for i, bone in enumerate(bone_table):
-            f.write(struct.pack("<I", i))  # dummy index (uint32)
-            f.write(struct.pack("<I", bone))  # bone index (uint32 in file, uint16 in C++)
+        buf.pack(_U32, len(bone_table))
+        # dummy index (uint32) + bone index (uint32 in file, uint16 in C++)
+        self.write_indexed(buf, np.asarray(bone_table, dtype="<u4"))
         
         # Write vertex count (uint32 in file, uint16 num_verts in C++)
-        vert_count = len(zms.vertices)
-        f.write(struct.pack("<I", vert_count))
+        vert_count = len(zms.positions)
+        buf.pack(_U32, vert_count)
         
         # Write vertex data (each with vertex_id prefix as uint32)
-        if zms.positions_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))  # vertex_id (uint32)
-                self.write_vector3_f32(f, v.position)  # vec3 (3x float)
-        
-        if zms.normals_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_vector3_f32(f, v.normal)  # vec3
-        
-        if zms.colors_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_color4(f, v.color)  # zz_color (4x float)
-        
-        if zms.bones_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                # vec4 blend_weight (4x float)
-                for w in v.bone_weights[:4]:
-                    f.write(struct.pack("<f", w))
-                # vec4 blend_index (stored as uint32 in file, indices into bone_table)
-                for bone_id in v.bone_indices[:4]:
-                    try:
-                        idx = bone_table.index(bone_id)
-                    except ValueError:
-                        idx = 0
-                    f.write(struct.pack("<I", idx))
-        
-        if zms.tangents_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_vector3_f32(f, v.tangent)  # vec3
-        
-        if zms.uv1_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_vector2_f32(f, v.uv1)  # vec2
-        
-        if zms.uv2_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_vector2_f32(f, v.uv2)
-        
-        if zms.uv3_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_vector2_f32(f, v.uv3)
-        
-        if zms.uv4_enabled():
-            for i, v in enumerate(zms.vertices):
-                f.write(struct.pack("<I", i))
-                self.write_vector2_f32(f, v.uv4)
+        # vec4 blend_index is stored as uint32 in file, indices into bone_table
+        for block in self.vertex_blocks(zms, bone_table, "<u4"):
+            self.write_indexed(buf, block)
         
         # Write triangle indices (usvec3 stored as uint32 in file, uint16 in C++)
-        f.write(struct.pack("<I", len(zms.indices)))  # uint32 num_faces in file
-        for i, idx in enumerate(zms.indices):
-            f.write(struct.pack("<I", i))  # triangle_id (uint32)
-            f.write(struct.pack("<I", int(idx.x)))  # uint32 in file
-            f.write(struct.pack("<I", int(idx.y)))
-            f.write(struct.pack("<I", int(idx.z)))
+        buf.pack(_U32, len(zms.indices))  # uint32 num_faces in file
+        self.write_indexed(buf, np.asarray(zms.indices, dtype="<u4"))  # triangle_id (uint32) + 3x uint32
         
         # Write materials (version 6 only) - uint16 matid_numfaces in C++, uint32 in file
         if version >= 6:
-            f.write(struct.pack("<I", len(zms.materials)))  # uint32 in file
-            for i, mat in enumerate(zms.materials):
-                f.write(struct.pack("<I", i))  # index (uint32)
-                f.write(struct.pack("<I", mat))  # uint32 in file (uint16 in C++)
+            buf.pack(_U32, len(zms.materials))  # uint32 in file
+            # index (uint32) + material face count (uint32 in file, uint16 in C++)
+            self.write_indexed(buf, np.asarray(zms.materials, dtype="<u4"))
     
-    def _write_version8(self, f, zms, version):
+    def _write_version8(self, buf, zms, version):
         """Write ZMS version 7 or 8 format
         
         File format matches C++ memory: uint16 for counts and indices
         """
         # Write bone count and bones (uint16 - std::vector<uint16>)
-        f.write(struct.pack("<H", len(zms.bones)))  # uint16 num_bones
-        for bone in zms.bones:
-            f.write(struct.pack("<H", bone))  # uint16 bone_indices[i]
+        buf.pack(_U16, len(zms.bones))  # uint16 num_bones
+        buf += np.asarray(zms.bones, dtype="<u2").tobytes()  # uint16 bone_indices[]
         
         # Write vertex count (uint16 num_verts)
-        vert_count = len(zms.vertices)
-        f.write(struct.pack("<H", vert_count))
+        vert_count = len(zms.positions)
+        buf.pack(_U16, vert_count)
         
         # Write vertex data (no vertex_id prefix)
-        if zms.positions_enabled():
-            for v in zms.vertices:
-                self.write_vector3_f32(f, v.position)  # vec3
-        
-        if zms.normals_enabled():
-            for v in zms.vertices:
-                self.write_vector3_f32(f, v.normal)  # vec3
-        
-        if zms.colors_enabled():
-            for v in zms.vertices:
-                self.write_color4(f, v.color)  # zz_color (4x float)
-        
-        if zms.bones_enabled():
-            for v in zms.vertices:
-                # vec4 blend_weight (4x float)
-                for w in v.bone_weights[:4]:
-                    f.write(struct.pack("<f", w))
-                # vec4 blend_index (stored as uint16 in file, indices into bones list)
-                for bone_id in v.bone_indices[:4]:
-                    try:
-                        idx = zms.bones.index(bone_id)
-                    except ValueError:
-                        idx = 0
-                    f.write(struct.pack("<H", idx))  # uint16
-        
-        if zms.tangents_enabled():
-            for v in zms.vertices:
-                self.write_vector3_f32(f, v.tangent)  # vec3
-        
-        if zms.uv1_enabled():
-            for v in zms.vertices:
-                self.write_vector2_f32(f, v.uv1)  # vec2
-        
-        if zms.uv2_enabled():
-            for v in zms.vertices:
-                self.write_vector2_f32(f, v.uv2)
-        
-        if zms.uv3_enabled():
-            for v in zms.vertices:
-                self.write_vector2_f32(f, v.uv3)
-        
-        if zms.uv4_enabled():
-            for v in zms.vertices:
-                self.write_vector2_f32(f, v.uv4)
+        # vec4 blend_index is stored as uint16 in file, indices into bones list
+        for block in self.vertex_blocks(zms, zms.bones, "<u2"):
+            buf += block.tobytes()
         
         # Write indices (flat array) - usvec3 = 3x uint16
-        f.write(struct.pack("<H", len(zms.indices)))  # uint16 num_faces
-        for idx in zms.indices:
-            f.write(struct.pack("<H", int(idx.x)))  # uint16
-            f.write(struct.pack("<H", int(idx.y)))
-            f.write(struct.pack("<H", int(idx.z)))
+        buf.pack(_U16, len(zms.indices))  # uint16 num_faces
+        buf += np.asarray(zms.indices, dtype="<u2").tobytes()
         
         # Write materials (uint16 matid_numfaces array)
-        f.write(struct.pack("<H", len(zms.materials)))  # uint16 num_matids
-        for mat in zms.materials:
-            f.write(struct.pack("<H", mat))  # uint16
+        buf.pack(_U16, len(zms.materials))  # uint16 num_matids
+        buf += np.asarray(zms.materials, dtype="<u2").tobytes()  # uint16
         
         # Write strips (uint16 ibuf_strip array)
-        f.write(struct.pack("<H", len(zms.strips)))  # uint16 count
-        for strip in zms.strips:
-            f.write(struct.pack("<H", strip))  # uint16
+        buf.pack(_U16, len(zms.strips))  # uint16 count
+        buf += np.asarray(zms.strips, dtype="<u2").tobytes()  # uint16
         
         # Write pool (version 8 only)
         if version >= 8:
-            f.write(struct.pack("<H", zms.pool))  # uint16
+            buf.pack(_U16, zms.pool)  # uint16
+    
+    def vertex_layout(self, flags):
+        """Return the vertex arrays written for flags, cached per combination"""
+        layout = self._vertex_layouts.get(flags)
+        if layout is None:
+            layout = tuple(attr for mask, attr in _VERTEX_SECTIONS if flags & mask == mask)
+            self._vertex_layouts[flags] = layout
+        return layout
+    
+    def vertex_blocks(self, zms, bone_table, index_dtype):
+        """Yield each vertex data block present in zms as a packed array, in file order"""
+        for attr in self.vertex_layout(zms.flags):
+            if attr == "bones":
+                # vec4 blend_weight (4x float) + vec4 blend_index
+                yield self.bone_array(zms, bone_table, index_dtype)
+            else:
+                yield np.asarray(getattr(zms, attr), dtype="<f4")
     
-    def write_vector2_f32(self, f, vec):
-        f.write(struct.pack("<f", vec.x))
-        f.write(struct.pack("<f", vec.y))
+    def write_vector3_f32(self, buf, vec):
+        buf.pack(_VEC3, vec.x, vec.y, vec.z)
     
-    def write_vector3_f32(self, f, vec):
-        f.write(struct.pack("<f", vec.x))
-        f.write(struct.pack("<f", vec.y))
-        f.write(struct.pack("<f", vec.z))
+    def bone_array(self, zms, bone_table, index_dtype):
+        """Pack interleaved blend weights and blend indices (into bone_table) per vertex"""
+        bones = np.empty(len(zms.positions), dtype=[("weights", "<f4", 4), ("indices", index_dtype, 4)])
+        bones["weights"] = zms.bone_weights
+        bones["indices"] = zms.bone_positions(bone_table, zms.bone_indices)
+        return bones
     
-    def write_color4(self, f, color):
-        f.write(struct.pack("<f", color.r))
-        f.write(struct.pack("<f", color.g))
-        f.write(struct.pack("<f", color.b))
-        f.write(struct.pack("<f", color.a))
+    def write_indexed(self, buf, values):
+        """Write one row per element prefixed with its uint32 id (version 5/6 layout)"""
+        rows = np.empty(len(values), dtype=[("id", "<u4"), ("value", values.dtype, values.shape[1:])])
+        rows["id"] = np.arange(len(values))
+        rows["value"] = values
+        buf += rows.tobytes()
@@ -84,12 +84,12 @@ class ImportZMD(bpy.types.Operator, ImportHelper):
         # bpy.ops.object.mode_set(mode='EDIT')  # Moved earlier
 
         # Create all bones first so parenting can be done later
-        for rose_bone in zmd.bones:
-            bone = armature.edit_bones.new(rose_bone.name)
+        edit_bones = armature.edit_bones
+        bones = [edit_bones.new(rose_bone.name) for rose_bone in zmd.bones]
+        for bone in bones:
             bone.use_connect = True
 
-        for idx, rose_bone in enumerate(zmd.bones):
-            bone = armature.edit_bones[idx]
+        for bone, rose_bone in zip(bones, zmd.bones):
 
             pos = bmath.Vector(rose_bone.position.as_tuple())
             rot = bmath.Quaternion(rose_bone.rotation.as_tuple(w_first=True))
@@ -101,6 +101,6 @@ class ImportZMD(bpy.types.Operator, ImportHelper):
                 if self.keep_root_bone:
                     bone.head.z += 0.00001  # Blender removes 0-length bones
             else:
-                bone.parent = armature.edit_bones[rose_bone.parent_id]
+                bone.parent = bones[rose_bone.parent_id]
 
                 # --- Old Blender 2.7 logic (kept for reference) -
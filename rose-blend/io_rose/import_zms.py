@@ -1,10 +1,6 @@
+import os
 from pathlib import Path
 
-if "bpy" in locals():
-    import importlib
-else:
-    from .rose.zms import *
-
 import bpy
 from bpy.props import StringProperty, BoolProperty
 from bpy_extras.io_utils import ImportHelper
@@ -23,6 +19,17 @@ class ImportZMS(bpy.types.Operator, ImportHelper):
                         "one can be found (uses file name)"),
         default=True,
     )
+    weld_vertices = BoolProperty(
+        name = "Weld Duplicate Vertices",
+        description = ( "Merge vertices that are identical in every "
+                        "attribute before building the mesh"),
+        default=True,
+    )
+    debug_logging = BoolProperty(
+        name = "Debug Logging",
+        description = "Report detailed import information",
+        default=False,
+    )
 
     texture_extensions = [".DDS", ".dds", ".PNG", ".png"]
 
@@ -34,26 +41,34 @@ class ImportZMS(bpy.types.Operator, ImportHelper):
         def report_wrapper(level, message):
             self.report({level}, message)
         
+        # numpy and the ZMS reader are only loaded once a ZMS is imported
+        from .rose.zms import ZMS
+
         try:
             zms = ZMS(str(filepath), report_func=report_wrapper)
         except Exception as e:
             self.report({'ERROR'}, f"Failed to load ZMS file: {str(e)}")
             return {'CANCELLED'}
 
-        # Debug logging
-        self.report({'INFO'}, f"=== ZMS Import Debug ===")
-        self.report({'INFO'}, f"Identifier: {zms.identifier}")
-        self.report({'INFO'}, f"Version: {zms.version}")
-        self.report({'INFO'}, f"Flags: {zms.flags}")
-        self.report({'INFO'}, f"Vertices: {len(zms.vertices)}")
-        self.report({'INFO'}, f"Indices: {len(zms.indices)}")
-        self.report({'INFO'}, f"Bones: {zms.bones}")
-        self.report({'INFO'}, f"Materials: {zms.materials}")
-        self.report({'INFO'}, f"Strips: {zms.strips}")
-        self.report({'INFO'}, f"Pool: {zms.pool}")
-        self.report({'INFO'}, f"Bounding Box Min: {zms.bounding_box_min}")
-        self.report({'INFO'}, f"Bounding Box Max: {zms.bounding_box_max}")
-        self.report({'INFO'}, f"=======================")
+        welded = zms.weld_vertices() if self.weld_vertices else 0
+
+        # Debug logging (one report, only formatted when enabled)
+        if self.debug_logging:
+            self.report({'INFO'}, "\n".join([
+                "=== ZMS Import Debug ===",
+                f"Identifier: {zms.identifier}",
+                f"Version: {zms.version}",
+                f"Flags: {zms.flags}",
+                f"Vertices: {len(zms.positions)} ({welded} duplicates welded)",
+                f"Indices: {len(zms.indices)}",
+                f"Bones: {zms.bones}",
+                f"Materials: {zms.materials}",
+                f"Strips: {zms.strips}",
+                f"Pool: {zms.pool}",
+                f"Bounding Box Min: {zms.bounding_box_min}",
+                f"Bounding Box Max: {zms.bounding_box_max}",
+                "=======================",
+            ]))
 
         mesh = self.mesh_from_zms(zms, filename)
 
@@ -68,91 +83,56 @@ class ImportZMS(bpy.types.Operator, ImportHelper):
                 # The group index corresponds to the index in the bones array
                 obj.vertex_groups.new(name=f"zms_bone_{i}")
 
-            # Assign weights per vertex. mesh.from_pydata created vertices in same order as zms.vertices
-            for vi, v in enumerate(zms.vertices):
-                # bone_weights is vec4 (4x float)
-                # bone_indices now contain the actual bone IDs (uint16 values after mapping)
-                for gi in range(4):
-                    try:
-                        weight = v.bone_weights[gi]
-                        bone_id = int(v.bone_indices[gi])
-                    except (IndexError, ValueError):
-                        continue
-
-                    if weight and weight > 0.0:
-                        # Find which group index corresponds to this bone_id
-                        # The bone_id should match zms.bones[group_index]
-                        try:
-                            group_index = zms.bones.index(bone_id)
-                            if 0 <= group_index < len(obj.vertex_groups):
-                                obj.vertex_groups[group_index].add([vi], weight, 'REPLACE')
-                        except ValueError:
-                            # bone_id not in bones list, skip
-                            pass
+            # Assign weights. Mesh vertices are in the same order as the ZMS vertices
+            self.assign_bone_weights(obj, zms)
 
         # Store ZMS metadata on the object for later export
         # These need to be stored so the exporter can recreate the exact file
         obj["zms_version"] = zms.version
         obj["zms_identifier"] = zms.identifier
-        obj["zms_materials"] = str(zms.materials)  # uint16 array (matid_numfaces)
-        obj["zms_strips"] = str(zms.strips)  # uint16 array (ibuf_strip)
+        # Lists are stored as native ID property int arrays
+        obj["zms_materials"] = [int(m) for m in zms.materials]  # uint16 array (matid_numfaces)
+        obj["zms_strips"] = [int(s) for s in zms.strips]  # uint16 array (ibuf_strip)
         obj["zms_pool"] = zms.pool  # uint16 pool type
-        obj["zms_bones"] = str(zms.bones)  # std::vector<uint16> bone_indices
+        obj["zms_bones"] = [int(b) for b in zms.bones]  # std::vector<uint16> bone_indices
 
         scene = context.scene
         context.collection.objects.link(obj)
 
-        self.report({'INFO'}, f"Imported {filename} (v{zms.version}, {len(zms.vertices)} verts, {len(zms.indices)} tris)")
+        self.report({'INFO'}, f"Imported {filename} (v{zms.version}, {len(zms.positions)} verts, {len(zms.indices)} tris)")
         return {"FINISHED"}
 
     def mesh_from_zms(self, zms, filename):
-        mesh = bpy.data.meshes.new(filename)
-
-        #-- Vertices (vec3 positions)
-        verts = []
-        for v in zms.vertices:
-            verts.append((v.position.x, v.position.y, v.position.z))
+        import numpy as np
+        from .rose.zms import VertexFlags
 
-        #-- Faces (usvec3 = 3x uint16 indices)
-        faces = []
-        for i in zms.indices:
-            faces.append((int(i.x), int(i.y), int(i.z)))
+        mesh = bpy.data.meshes.new(filename)
 
-        #-- Mesh
-        mesh.from_pydata(verts, [], faces)
+        #-- Mesh (vec3 positions, usvec3 = 3x uint16 indices)
+        try:
+            self.fill_geometry(mesh, zms)
+        except (AttributeError, TypeError, RuntimeError):
+            # Fall back to the generic (slower) path on API mismatch
+            mesh.clear_geometry()
+            mesh.from_pydata(zms.positions.tolist(), [], zms.indices.tolist())
 
         #-- UV (vec2 coordinates, up to 4 channels)
-        if zms.uv1_enabled():
-            mesh.uv_layers.new(name="uv1")
-        if zms.uv2_enabled():
-            mesh.uv_layers.new(name="uv2")
-        if zms.uv3_enabled():
-            mesh.uv_layers.new(name="uv3")
-        if zms.uv4_enabled():
-            mesh.uv_layers.new(name="uv4")
-
-        for loop_idx, loop in enumerate(mesh.loops):
-            vi = loop.vertex_index
-
-            if zms.uv1_enabled():
-                u = zms.vertices[vi].uv1.x
-                v = zms.vertices[vi].uv1.y
-                mesh.uv_layers["uv1"].data[loop_idx].uv = (u, 1-v)  # Flip V
-            
-            if zms.uv2_enabled():
-                u = zms.vertices[vi].uv2.x
-                v = zms.vertices[vi].uv2.y
-                mesh.uv_layers["uv2"].data[loop_idx].uv = (u, 1-v)  # Flip V
-            
-            if zms.uv3_enabled():
-                u = zms.vertices[vi].uv3.x
-                v = zms.vertices[vi].uv3.y
-                mesh.uv_layers["uv3"].data[loop_idx].uv = (u, 1-v)  # Flip V
-            
-            if zms.uv4_enabled():
-                u = zms.vertices[vi].uv4.x
-                v = zms.vertices[vi].uv4.y
-                mesh.uv_layers["uv4"].data[loop_idx].uv = (u, 1-v)  # Flip V
+        uv_channels = [
+            (name, getattr(zms, name))
+            for name, flag in (("uv1", VertexFlags.UV1), ("uv2", VertexFlags.UV2),
+                               ("uv3", VertexFlags.UV3), ("uv4", VertexFlags.UV4))
+            if zms.flags & flag
+        ]
+        # Gather per-loop UVs from the per-vertex arrays, one foreach_set per channel
+        if uv_channels:
+            loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get("vertex_index", loop_verts)
+        for name, vertex_uvs in uv_channels:
+            uvs = vertex_uvs[loop_verts]
+            uvs[:, 1] = 1.0 - uvs[:, 1]  # Flip V
+            # Fill the returned layer right away, adding a layer can invalidate older references
+            uv_layer = mesh.uv_layers.new(name=name)
+            uv_layer.data.foreach_set("uv", uvs.ravel())
 
         #-- Material
         mat = bpy.data.materials.new(filename)
@@ -164,19 +144,99 @@ class ImportZMS(bpy.types.Operator, ImportHelper):
 
         if self.load_texture:
             # Check if DDS or PNG exists
-            for ext in self.texture_extensions:
-                filepath = Path(self.filepath)
-                p = filepath.with_suffix(ext)
-                if not p.is_file():
-                    continue
-
-                image = bpy.data.images.load(str(p))
+            texture_path = self.find_texture(Path(self.filepath))
+            if texture_path is not None:
+                image = bpy.data.images.load(texture_path)
                 tex_node.image = image
-                break
 
         links = mat.node_tree.links
         links.new(tex_node.outputs["Color"], mat_node.inputs["Base Color"])
         mesh.materials.append(mat)
 
-        mesh.update(calc_edges=True)
+        # validate() deletes degenerate and duplicate faces, which shifts the
+        # zms_materials face ranges, so only run it on broken index data
+        out_of_range = len(zms.indices) > 0 and int(zms.indices.max()) >= len(zms.positions)
+        if (out_of_range or zms.bad_face_count(zms.indices) > 0) and mesh.validate():
+            self.report({'WARNING'}, (f"{filename}: invalid geometry was removed, "
+                                      "material face ranges may no longer match"))
+
+        # Edges already exist (fill_geometry or from_pydata)
+        mesh.update(calc_edges=False)
         return mesh
+
+    def find_texture(self, filepath):
+        """Find a texture named like filepath with one directory scan
+        
+        Names match case-insensitively; exact name matches win, then
+        texture_extensions order.
+        """
+        extensions = [ext.lower() for ext in self.texture_extensions]
+        stem = filepath.stem.lower()
+        best = None
+        try:
+            with os.scandir(filepath.parent) as entries:
+                for entry in entries:
+                    name = Path(entry.name)
+                    ext = name.suffix.lower()
+                    if name.stem.lower() != stem or ext not in extensions:
+                        continue
+                    if name.stem == filepath.stem and name.suffix in self.texture_extensions:
+                        rank = self.texture_extensions.index(name.suffix)
+                    else:
+                        rank = len(extensions) + extensions.index(ext)
+                    if (best is None or rank < best[0]) and entry.is_file():
+                        best = (rank, entry.path)
+        except OSError:
+            return None
+        return best[1] if best else None
+
+    def assign_bone_weights(self, obj, zms):
+        """Add vertex bone weights to the zms_bone_* groups, one add() per (group, weight)"""
+        import numpy as np
+
+        # bone_weights is vec4 (4x float)
+        # bone_indices contain the actual bone IDs (uint16 values after mapping)
+        # Group index = first position of the bone ID in zms.bones (-1 if absent)
+        slot_groups = zms.bone_positions(zms.bones, zms.bone_indices, missing=-1)
+        verts, slots = np.nonzero((slot_groups >= 0) & (zms.bone_weights > 0.0))
+        groups = slot_groups[verts, slots]
+        weights = zms.bone_weights[verts, slots]
+
+        # A bone repeated within a vertex keeps its last slot's weight ('REPLACE' order)
+        _, last = np.unique((verts * len(zms.bones) + groups)[::-1], return_index=True)
+        keep = len(verts) - 1 - last
+        verts, groups, weights = verts[keep], groups[keep], weights[keep]
+
+        order = np.lexsort((verts, weights, groups))
+        verts, groups, weights = verts[order], groups[order], weights[order]
+        starts = np.flatnonzero(np.diff(groups, prepend=-1) | (np.diff(weights, prepend=np.nan) != 0))
+        for start, end in zip(starts.tolist(), np.append(starts[1:], len(verts)).tolist()):
+            group = obj.vertex_groups[int(groups[start])]
+            group.add(verts[start:end].tolist(), float(weights[start]), 'REPLACE')
+
+    def fill_geometry(self, mesh, zms):
+        """Add vertices and triangles to an empty mesh straight from the ZMS arrays"""
+        import numpy as np
+
+        face_count = len(zms.indices)
+        mesh.vertices.add(len(zms.positions))
+        mesh.vertices.foreach_set("co", np.ascontiguousarray(zms.positions, dtype=np.float32).ravel())
+
+        # One edge per unique vertex pair; each loop uses the edge to the next corner
+        loop_verts = zms.indices.astype(np.int32)
+        next_verts = np.roll(loop_verts, -1, axis=1)
+        pairs = np.sort(np.stack((loop_verts, next_verts), axis=2).reshape(-1, 2), axis=1)
+        edges, loop_edges = np.unique(pairs, axis=0, return_inverse=True)
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.astype(np.int32).ravel())
+
+        mesh.loops.add(face_count * 3)
+        mesh.loops.foreach_set("vertex_index", loop_verts.ravel())
+        mesh.loops.foreach_set("edge_index", loop_edges.astype(np.int32).ravel())
+
+        mesh.polygons.add(face_count)
+        mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+        try:
+            mesh.polygons.foreach_set("loop_total", np.full(face_count, 3, dtype=np.int32))
+        except (AttributeError, TypeError):
+            pass  # Read-only (derived from loop_start) since Blender 4.0
@@ -155,12 +155,28 @@ def read_list_i16(f, n):
         a.append(read_i16(f))
     return a
 
+def read_list_u16(f, n):
+    a = []
+    for i in range(n):
+        a.append(read_u16(f))
+    return a
+
 def read_list_f32(f, n):
     a = []
     for i in range(n):
         a.append(read_f32(f))
     return a
 
+def read_array(f, dtype, n):
+    """ Read n items of a (little-endian) numpy dtype as one read-only array """
+    import numpy as np
+
+    dtype = np.dtype(dtype)
+    data = f.read(dtype.itemsize * n)
+    if len(data) != dtype.itemsize * n:
+        raise EOFError("Unexpected end of file")
+    return np.frombuffer(data, dtype=dtype, count=n)
+
 def read_quat_wxyz(f):
     w = read_f32(f)
     x = read_f32(f)
@@ -1,4 +1,5 @@
 from enum import IntEnum
+import numpy as np
 from .utils import *
 
 class VertexFlags(IntEnum):
@@ -33,8 +34,8 @@ class ZMS:
         self.flags = 0  # int (vertex_format in C++)
         self.bounding_box_min = Vector3(0, 0, 0)  # vec3
         self.bounding_box_max = Vector3(0, 0, 0)  # vec3
-        self.vertices = []
-        self.indices = []  # stored as usvec3 (3x uint16) per face
+        self.alloc_vertices(0)  # per-vertex data, one array per attribute
+        self.indices = np.zeros((0, 3), dtype=np.uint16)  # usvec3 (3x uint16) per face
         self.bones = []  # std::vector<uint16> bone_indices in C++
         self.materials = []  # uint16 array (matid_numfaces)
         self.strips = []  # uint16 array (ibuf_strip)
@@ -45,6 +46,70 @@ class ZMS:
             with open(filepath, "rb") as f:
                 self.read(f)
     
+    def alloc_vertices(self, count):
+        """Allocate zeroed per-vertex arrays (struct of arrays) for count vertices"""
+        self.positions = np.zeros((count, 3), dtype=np.float32)  # vec3
+        self.normals = np.zeros((count, 3), dtype=np.float32)  # vec3
+        self.colors = np.zeros((count, 4), dtype=np.float32)  # zz_color (4x float)
+        self.bone_weights = np.zeros((count, 4), dtype=np.float32)  # vec4 (4x float)
+        self.bone_indices = np.zeros((count, 4), dtype=np.uint16)  # bone IDs (mapped through bones)
+        self.tangents = np.zeros((count, 3), dtype=np.float32)  # vec3
+        self.uv1 = np.zeros((count, 2), dtype=np.float32)  # vec2
+        self.uv2 = np.zeros((count, 2), dtype=np.float32)  # vec2
+        self.uv3 = np.zeros((count, 2), dtype=np.float32)  # vec2
+        self.uv4 = np.zeros((count, 2), dtype=np.float32)  # vec2
+
+    def weld_vertices(self):
+        """Merge vertices identical in every attribute and remap the indices
+        and strips
+        
+        Nothing is merged if that would make a triangle repeat a vertex or
+        duplicate another one (faces can't be dropped, the material face
+        ranges depend on them), or if an index or strip is out of range.
+        Returns the number of vertices removed.
+        """
+        vert_count = len(self.positions)
+        if len(self.indices) > 0 and int(self.indices.max()) >= vert_count:
+            return 0
+        if len(self.strips) > 0 and max(self.strips) >= vert_count:
+            return 0
+
+        names = ("positions", "normals", "colors", "bone_weights", "bone_indices",
+                 "tangents", "uv1", "uv2", "uv3", "uv4")
+        arrays = [getattr(self, name) for name in names]
+        rows = np.empty(len(self.positions), dtype=[(name, a.dtype, a.shape[1:]) for name, a in zip(names, arrays)])
+        for name, a in zip(names, arrays):
+            rows[name] = a
+
+        keys = rows.view(np.dtype((np.void, rows.dtype.itemsize)))
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        removed = len(rows) - len(first)
+        if removed == 0:
+            return 0
+
+        # Keep surviving vertices in their original order
+        order = np.argsort(first, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        indices = remap[inverse.ravel()][self.indices]
+        if self.bad_face_count(indices) > self.bad_face_count(self.indices):
+            return 0
+
+        keep = first[order]
+        for name in names:
+            setattr(self, name, getattr(self, name)[keep])
+        self.indices = indices.astype(np.uint16)
+        if len(self.strips) > 0:
+            vertex_map = remap[inverse.ravel()]
+            self.strips = vertex_map[np.asarray(self.strips, dtype=np.int64)].tolist()
+        return removed
+
+    def bad_face_count(self, indices):
+        """Count triangles that repeat a vertex or duplicate another triangle"""
+        tris = np.sort(indices, axis=1)
+        degenerate = np.count_nonzero((tris[:, 0] == tris[:, 1]) | (tris[:, 1] == tris[:, 2]))
+        return degenerate + len(tris) - len(np.unique(tris, axis=0))
+
     def report(self, level, message):
         """Helper method to report messages either via callback or print"""
         if self.report_func:
@@ -110,95 +175,90 @@ class ZMS:
         self.bounding_box_min = read_vector3_f32(f)  # vec3
         self.bounding_box_max = read_vector3_f32(f)  # vec3
 
-        # Read bone lookup table
+        # Read bone lookup table (dummy index + uint32 bone index per entry)
         bone_count = read_u32(f)  # uint32 in v5/6
-        bone_table = []
-        for i in range(bone_count):
-            _ = read_u32(f)  # Skip first u32 (dummy index)
-            bone_table.append(read_u32(f))  # uint32 bone index
+        bone_table = self._read_indexed(f, bone_count, "<u4").tolist()
 
         vert_count = read_u32(f)  # uint32 in v5/6 (but stored as uint16 in C++)
-        for i in range(vert_count):
-            self.vertices.append(Vertex())
+        self.alloc_vertices(vert_count)
 
+        # Every vertex section is one block of vertex_id (uint32) + value rows
         # Read positions (scaled by 100.0 in version 5/6)
         if self.positions_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                pos = read_vector3_f32(f)  # vec3
-                # Divide by 100.0 to unscale
-                self.vertices[i].position = Vector3(pos.x / 100.0, pos.y / 100.0, pos.z / 100.0)
+            self.positions[:] = self._read_indexed(f, vert_count, "<f4", 3)  # vec3
+            # Divide by 100.0 to unscale (in place, stays float32)
+            self.positions /= np.float32(100.0)
 
         # Read normals
         if self.normals_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].normal = read_vector3_f32(f)  # vec3
+            self.normals[:] = self._read_indexed(f, vert_count, "<f4", 3)  # vec3
 
         # Read colors
         if self.colors_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].color = read_color4(f)  # zz_color (4x float)
+            self.colors[:] = self._read_indexed(f, vert_count, "<f4", 4)  # zz_color (4x float)
 
         # Read bone weights and indices
         if self.bones_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].bone_weights = read_list_f32(f, 4)  # vec4 (4x float)
-                bone_indices_raw = read_list_u32(f, 4)  # vec4 stored as uint32 in file
-                # Map through bone table (indices into bone_table)
-                self.vertices[i].bone_indices = [
-                    bone_table[idx] if idx < len(bone_table) else 0
-                    for idx in bone_indices_raw
-                ]
+            # vec4 (4x float) weights + vec4 stored as uint32 in file
+            bones = read_array(f, [("id", "<u4"), ("weights", "<f4", 4), ("indices", "<u4", 4)], vert_count)
+            self.bone_weights[:] = bones["weights"]
+            # Map through bone table (indices into bone_table)
+            self.bone_indices[:] = self._map_bones(bone_table, bones["indices"])
 
         # Read tangents
         if self.tangents_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].tangent = read_vector3_f32(f)  # vec3
+            self.tangents[:] = self._read_indexed(f, vert_count, "<f4", 3)  # vec3
 
         # Read UV coordinates
         if self.uv1_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].uv1 = read_vector2_f32(f)  # vec2
+            self.uv1[:] = self._read_indexed(f, vert_count, "<f4", 2)  # vec2
 
         if self.uv2_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].uv2 = read_vector2_f32(f)  # vec2
+            self.uv2[:] = self._read_indexed(f, vert_count, "<f4", 2)  # vec2
 
         if self.uv3_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].uv3 = read_vector2_f32(f)  # vec2
+            self.uv3[:] = self._read_indexed(f, vert_count, "<f4", 2)  # vec2
 
         if self.uv4_enabled():
-            for i in range(vert_count):
-                _ = read_u32(f)  # vertex_id (uint32)
-                self.vertices[i].uv4 = read_vector2_f32(f)  # vec2
+            self.uv4[:] = self._read_indexed(f, vert_count, "<f4", 2)  # vec2
 
         # Read triangle indices (usvec3 = 3x uint16, but stored as uint32 in v5/6 file format)
         triangle_count = read_u32(f)  # uint32 in v5/6
-        for i in range(triangle_count):
-            _ = read_u32(f)  # triangle_id (uint32)
-            idx1 = read_u32(f)  # uint32 in file
-            idx2 = read_u32(f)  # uint32 in file
-            idx3 = read_u32(f)  # uint32 in file
-            self.indices.append(Vector3(idx1, idx2, idx3))
+        # Rows of triangle_id (uint32) + 3x uint32 in file
+        rows = read_array(f, "<u4", triangle_count * 4).reshape(-1, 4)
+        indices = rows[:, 1:4]
+        # Stored as uint16 in memory, larger values would silently wrap
+        if indices.size > 0 and int(indices.max()) > 0xFFFF:
+            raise ValueError(f"Face index out of range: {int(indices.max())}")
+        self.indices = indices.astype(np.uint16)
 
         # Read materials (version 6 only) - uint16 * num_matids
         if version >= 6:
             material_count = read_u32(f)  # uint32 count in file
-            for i in range(material_count):
-                _ = read_u32(f)  # index (uint32)
-                self.materials.append(read_u32(f))  # uint32 in file (but uint16 in C++)
+            # index (uint32) + uint32 in file (but uint16 in C++)
+            self.materials = self._read_indexed(f, material_count, "<u4").tolist()
 
         # Populate bones list from bone_table (std::vector<uint16>)
         self.bones = bone_table
 
+    def _map_bones(self, bone_table, indices):
+        """Look up bone IDs for indices into bone_table, 0 where out of range"""
+        table = np.append(np.asarray(bone_table, dtype=np.int64), 0)
+        return table[np.minimum(indices, len(bone_table))]
+
+    def bone_positions(self, bone_table, bone_ids, missing=0):
+        """Map bone IDs to their first position in bone_table (missing if absent)"""
+        table_ids, first = np.unique(np.asarray(bone_table, dtype=np.int64), return_index=True)
+        if len(table_ids) == 0:
+            return np.full(np.shape(bone_ids), missing, dtype=np.int64)
+        pos = np.searchsorted(table_ids, bone_ids).clip(max=len(table_ids) - 1)
+        return np.where(table_ids[pos] == bone_ids, first[pos], missing)
+
+    def _read_indexed(self, f, n, dtype, count=None):
+        """Read n version 5/6 rows of uint32 id + value(s) and return the values"""
+        value = ("value", dtype) if count is None else ("value", dtype, count)
+        return read_array(f, [("id", "<u4"), value], n)["value"]
+
     def _read_version8(self, f, version):
         """Read ZMS version 7 or 8 format
         
@@ -214,57 +274,43 @@ class ZMS:
             self.bones.append(read_u16(f))  # uint16 bone_indices[i]
 
         vert_count = read_u16(f)  # uint16 (matches C++ num_verts)
-        for i in range(vert_count):
-            self.vertices.append(Vertex())
+        self.alloc_vertices(vert_count)
 
-        # Read vertex data (no vertex_id prefix in version 7/8)
+        # Read vertex data (no vertex_id prefix in version 7/8), one block per attribute
         if self.positions_enabled():
-            for i in range(vert_count):
-                self.vertices[i].position = read_vector3_f32(f)  # vec3
+            self.positions[:] = read_array(f, "<f4", vert_count * 3).reshape(-1, 3)  # vec3
 
         if self.normals_enabled():
-            for i in range(vert_count):
-                self.vertices[i].normal = read_vector3_f32(f)  # vec3
+            self.normals[:] = read_array(f, "<f4", vert_count * 3).reshape(-1, 3)  # vec3
 
         if self.colors_enabled():
-            for i in range(vert_count):
-                self.vertices[i].color = read_color4(f)  # zz_color (4x float)
+            self.colors[:] = read_array(f, "<f4", vert_count * 4).reshape(-1, 4)  # zz_color (4x float)
 
         if self.bones_enabled():
-            for i in range(vert_count):
-                self.vertices[i].bone_weights = read_list_f32(f, 4)  # vec4 (4x float)
-                bone_indices_raw = read_list_u16(f, 4)  # vec4 stored as uint16 in file
-                # Map through bones list - indices are into bones array
-                self.vertices[i].bone_indices = [
-                    self.bones[idx] if idx < len(self.bones) else 0
-                    for idx in bone_indices_raw
-                ]
+            # Interleaved vec4 (4x float) weights + vec4 stored as uint16 in file
+            bones = read_array(f, [("weights", "<f4", 4), ("indices", "<u2", 4)], vert_count)
+            self.bone_weights[:] = bones["weights"]
+            # Map through bones list - indices are into bones array
+            self.bone_indices[:] = self._map_bones(self.bones, bones["indices"])
 
         if self.tangents_enabled():
-            for i in range(vert_count):
-                self.vertices[i].tangent = read_vector3_f32(f)  # vec3
+            self.tangents[:] = read_array(f, "<f4", vert_count * 3).reshape(-1, 3)  # vec3
 
         if self.uv1_enabled():
-            for i in range(vert_count):
-                self.vertices[i].uv1 = read_vector2_f32(f)  # vec2
+            self.uv1[:] = read_array(f, "<f4", vert_count * 2).reshape(-1, 2)  # vec2
 
         if self.uv2_enabled():
-            for i in range(vert_count):
-                self.vertices[i].uv2 = read_vector2_f32(f)  # vec2
+            self.uv2[:] = read_array(f, "<f4", vert_count * 2).reshape(-1, 2)  # vec2
 
         if self.uv3_enabled():
-            for i in range(vert_count):
-                self.vertices[i].uv3 = read_vector2_f32(f)  # vec2
+            self.uv3[:] = read_array(f, "<f4", vert_count * 2).reshape(-1, 2)  # vec2
 
         if self.uv4_enabled():
-            for i in range(vert_count):
-                self.vertices[i].uv4 = read_vector2_f32(f)  # vec2
+            self.uv4[:] = read_array(f, "<f4", vert_count * 2).reshape(-1, 2)  # vec2
 
         # Read indices - flat array (usvec3 = 3x uint16)
         index_count = read_u16(f)  # uint16 num_faces (matches C++)
-        indices_flat = read_list_u16(f, index_count * 3)  # uint16 indices
-        for i in range(0, len(indices_flat), 3):
-            self.indices.append(Vector3(indices_flat[i], indices_flat[i+1], indices_flat[i+2]))
+        self.indices = read_array(f, "<u2", index_count * 3).reshape(-1, 3).astype(np.uint16)  # uint16 indices
 
         # Read materials (uint16 * num_matids)
         material_count = read_u16(f)  # uint16 num_matids
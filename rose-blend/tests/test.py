@@ -2,6 +2,8 @@ import os
 import sys
 import unittest
 
+import numpy as np
+
 DIR = os.path.abspath(os.path.dirname(__file__))
 ROOT_DIR = os.path.dirname(DIR)
 DATA_DIR = os.path.join(DIR, "data")
@@ -68,7 +70,7 @@ class RoseTests(unittest.TestCase):
         self.assertEqual(zms.uv3_enabled(), False)
         self.assertEqual(zms.uv4_enabled(), False)
         
-        self.assertEqual(len(zms.vertices), 183)
+        self.assertEqual(len(zms.positions), 183)
         self.assertEqual(len(zms.indices), 292)
         self.assertEqual(len(zms.bones), 0)
         self.assertEqual(len(zms.materials), 3)
@@ -90,13 +92,37 @@ class RoseTests(unittest.TestCase):
         self.assertEqual(zms.uv3_enabled(), False)
         self.assertEqual(zms.uv4_enabled(), False)
         
-        self.assertEqual(len(zms.vertices), 175)
+        self.assertEqual(len(zms.positions), 175)
         self.assertEqual(len(zms.indices), 258)
         self.assertEqual(len(zms.bones), 12)
         self.assertEqual(len(zms.materials), 0)
         self.assertEqual(len(zms.strips), 474)
         self.assertEqual(zms.pool, 0)
 
+    def test_zms_weld_vertices(self):
+        zms = ZMS()
+        zms.alloc_vertices(5)
+        zms.positions[:] = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 0, 0], [1, 1, 0]]
+        zms.indices = np.array([[0, 1, 2], [2, 3, 4]], dtype=np.uint16)
+        zms.strips = [0, 1, 2, 3, 4]
+
+        self.assertEqual(zms.weld_vertices(), 1)
+        self.assertEqual(len(zms.positions), 4)
+        self.assertEqual(zms.indices.tolist(), [[0, 1, 2], [2, 1, 3]])
+        self.assertEqual(zms.strips, [0, 1, 2, 1, 3])
+
+        # Out-of-range indices or strips leave the mesh untouched
+        for indices, strips in (([[0, 1, 2], [2, 3, 7]], []), ([[0, 1, 2], [2, 3, 4]], [0, 1, 5])):
+            zms.alloc_vertices(5)
+            zms.positions[:] = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 0, 0], [1, 1, 0]]
+            zms.indices = np.array(indices, dtype=np.uint16)
+            zms.strips = strips
+
+            self.assertEqual(zms.weld_vertices(), 0)
+            self.assertEqual(len(zms.positions), 5)
+            self.assertEqual(zms.indices.tolist(), indices)
+            self.assertEqual(zms.strips, strips)
+
     def test_zon(self):
         zon_file = os.path.join(DATA_DIR, "JPT01.ZON")
         z = Zon(zon_file)